@@ -4,20 +4,70 @@ MCP server providing calculator functionality with advanced math operations.
 """
 
 import asyncio
+import itertools
 import json
 import math
+import statistics
+from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
 from typing import List, Union
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Create server instance
 server = Server("calculator-server")
 
-# Store calculation history
-calculation_history: List[str] = []
+# Store calculation history (bounded so long sessions don't grow without limit)
+calculation_history: deque = deque(maxlen=1000)
 last_result: float = 0
 
+# Below this size converting the list to an array costs more than median and
+# std_dev save by running in NumPy
+_NUMPY_MIN_SIZE = 1000
+# Above this size the JIT std_dev kernel spreads its loop across threads
+_PARALLEL_MIN_SIZE = 10_000
+
+# Names available to expressions, built once at import
+_ALLOWED_NAMES = MappingProxyType({
+    **{k: v for k, v in math.__dict__.items() if not k.startswith("__")},
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max
+})
+
+# Characters allowed in an expression; str.translate strips them in C, so
+# anything left over is invalid
+_VALID_CHARS = "0123456789+-*/().,"
+_REMOVE_VALID = str.maketrans("", "", _VALID_CHARS)
+
+# Factorials small enough for a lookup; larger values use math.factorial
+_FACTORIALS = tuple(math.factorial(i) for i in range(21))
+
+# Unit conversions as (scale, offset): result = value * scale + offset
+_CONVERSIONS = {
+    ("km", "miles"): (0.621371, 0.0),
+    ("miles", "km"): (1.60934, 0.0),
+    ("m", "ft"): (3.28084, 0.0),
+    ("ft", "m"): (1 / 3.28084, 0.0),
+    ("celsius", "fahrenheit"): (9 / 5, 32.0),
+    ("fahrenheit", "celsius"): (5 / 9, -32 * 5 / 9),
+    ("kg", "lbs"): (2.20462, 0.0),
+    ("lbs", "kg"): (1 / 2.20462, 0.0),
+}
+
 @server.list_tools()
 async def list_tools():
     """List available calculator tools."""
@@ -117,168 +167,234 @@ async def list_tools():
         )
     ]
 
+@lru_cache(maxsize=256)
+def _compile_expr(expr: str):
+    """Compile a normalized expression once and reuse the code object."""
+    return compile(expr, "<calc>", "eval")
+
 def safe_eval(expression: str) -> float:
     """Safely evaluate mathematical expressions."""
-    # Allow only safe operations
-    allowed_names = {
-        k: v for k, v in math.__dict__.items() if not k.startswith("__")
-    }
-    allowed_names.update({
-        "abs": abs,
-        "round": round,
-        "min": min,
-        "max": max
-    })
+    # Remove spaces and replace ^ with ** for exponentiation
+    expr = expression.replace(" ", "").replace("^", "**")
     
-    # Remove spaces and validate characters
-    expr = expression.replace(" ", "")
-    valid_chars = set("0123456789+-*/().,")
-    if not all(c in valid_chars for c in expr):
+    # Validate characters
+    if expr.translate(_REMOVE_VALID):
         raise ValueError(f"Invalid characters in expression: {expression}")
     
     try:
-        # Replace ^ with ** for exponentiation
-        expr = expr.replace("^", "**")
-        result = eval(expr, {"__builtins__": {}}, allowed_names)
+        result = eval(_compile_expr(expr), {"__builtins__": {}}, _ALLOWED_NAMES)
         return float(result)
     except Exception as e:
         raise ValueError(f"Invalid expression: {str(e)}")
 
+if njit is not None:
+    # Kernels compile on their first large input (and are cached on disk),
+    # not at import, so starting the server stays cheap
+    @njit(fastmath=True, cache=True)
+    def _std_dev_njit(arr):
+        mean = arr.sum() / arr.size
+        total_sq = 0.0
+        for i in range(arr.size):
+            d = arr[i] - mean
+            total_sq += d * d
+        return math.sqrt(total_sq / arr.size)
+
+    @njit(fastmath=True, cache=True, parallel=True)
+    def _std_dev_njit_parallel(arr):
+        mean = arr.sum() / arr.size
+        total_sq = 0.0
+        for i in prange(arr.size):
+            d = arr[i] - mean
+            total_sq += d * d
+        return math.sqrt(total_sq / arr.size)
+
+def _use_numpy(numbers: List[float]) -> bool:
+    """Whether a statistics input is large enough for the NumPy path."""
+    return np is not None and len(numbers) >= _NUMPY_MIN_SIZE
+
+def _as_array(numbers: List[float]):
+    return np.asarray(numbers, dtype=np.float64)
+
+def _median_numpy(numbers: List[float]) -> float:
+    """Median via np.argpartition, returning the input's own values."""
+    # Indexing back into the list keeps integer medians exact, as
+    # statistics.median does
+    mid = len(numbers) // 2
+    if len(numbers) % 2:
+        return numbers[np.argpartition(_as_array(numbers), mid)[mid]]
+    idx = np.argpartition(_as_array(numbers), (mid - 1, mid))
+    return (numbers[idx[mid - 1]] + numbers[idx[mid]]) / 2
+
+def _median(numbers: List[float]) -> float:
+    if _use_numpy(numbers):
+        # Select with a partition rather than a full sort
+        return _median_numpy(numbers)
+    return statistics.median(numbers)
+
+def _two_pass_std_dev(numbers: List[float]) -> float:
+    """Population standard deviation, subtracting the mean in a second pass."""
+    mean = sum(numbers) / len(numbers)
+    variance = sum((x - mean) ** 2 for x in numbers) / len(numbers)
+    return math.sqrt(variance)
+
+def _std_dev(numbers: List[float]) -> float:
+    if _use_numpy(numbers):
+        arr = _as_array(numbers)
+        if njit is None:
+            return float(arr.std())
+        if arr.size >= _PARALLEL_MIN_SIZE:
+            return _std_dev_njit_parallel(arr)
+        return _std_dev_njit(arr)
+    return _two_pass_std_dev(numbers)
+
+async def _handle_calculate(arguments: dict):
+    """Evaluate an arithmetic expression."""
+    global last_result
+    
+    expression = arguments["expression"]
+    
+    # Replace 'ans' with last result, lowercasing only when an 'a' is present
+    if "a" in expression or "A" in expression:
+        lowered = expression.lower()
+        if "ans" in lowered:
+            expression = lowered.replace("ans", repr(last_result))
+    
+    result = safe_eval(expression)
+    last_result = result
+    
+    # Add to history
+    history_entry = f"{expression} = {result}"
+    calculation_history.append(history_entry)
+    
+    return [TextContent(
+        type="text",
+        text=f"{history_entry}"
+    )]
+
+async def _handle_scientific_calc(arguments: dict):
+    """Apply a scientific function to a value."""
+    global last_result
+    
+    operation = arguments["operation"]
+    value = float(arguments["value"])
+    
+    if operation == "sin":
+        result = math.sin(math.radians(value))
+    elif operation == "cos":
+        result = math.cos(math.radians(value))
+    elif operation == "tan":
+        result = math.tan(math.radians(value))
+    elif operation == "log":
+        base = float(arguments.get("base", 10))
+        result = math.log(value, base)
+    elif operation == "ln":
+        result = math.log(value)
+    elif operation == "sqrt":
+        result = math.sqrt(value)
+    elif operation == "pow":
+        base = float(arguments.get("base", 2))
+        # No integer-exponent fast path: CPython's float ** int also ends up
+        # in libm pow(), after an extra int-to-float conversion
+        result = math.pow(value, base)
+    elif operation == "factorial":
+        n = int(value)
+        result = _FACTORIALS[n] if 0 <= n <= 20 else math.factorial(n)
+    else:
+        return [TextContent(type="text", text=f"Unknown operation: {operation}")]
+    
+    last_result = result
+    history_entry = f"{operation}({value}) = {result}"
+    calculation_history.append(history_entry)
+    
+    return [TextContent(type="text", text=history_entry)]
+
+async def _handle_statistics(arguments: dict):
+    """Compute a statistic over a list of numbers."""
+    numbers = arguments["numbers"]
+    operation = arguments["operation"]
+    
+    if not numbers:
+        return [TextContent(type="text", text="No numbers provided")]
+    
+    if operation == "mean":
+        # Builtin sum beats converting to an array here and for "sum" below,
+        # and keeps integer sums exact
+        result = sum(numbers) / len(numbers)
+    elif operation == "median":
+        result = _median(numbers)
+    elif operation == "mode":
+        from collections import Counter
+        counts = Counter(numbers)
+        max_count = max(counts.values())
+        modes = [k for k, v in counts.items() if v == max_count]
+        result = modes[0] if len(modes) == 1 else modes
+    elif operation == "std_dev":
+        result = _std_dev(numbers)
+    elif operation == "sum":
+        # Builtin sum, exact for integer input
+        result = sum(numbers)
+    else:
+        return [TextContent(type="text", text=f"Unknown operation: {operation}")]
+    
+    return [TextContent(
+        type="text",
+        text=f"{operation} of {numbers} = {result}"
+    )]
+
+async def _handle_unit_convert(arguments: dict):
+    """Convert a value between units."""
+    value = float(arguments["value"])
+    from_unit = arguments["from_unit"].lower()
+    to_unit = arguments["to_unit"].lower()
+    
+    conversion = _CONVERSIONS.get((from_unit, to_unit))
+    if conversion is not None:
+        scale, offset = conversion
+        result = value * scale + offset
+        return [TextContent(
+            type="text",
+            text=f"{value} {from_unit} = {result:.4f} {to_unit}"
+        )]
+    else:
+        return [TextContent(
+            type="text",
+            text=f"Conversion from {from_unit} to {to_unit} not supported"
+        )]
+
+async def _handle_history(arguments: dict):
+    """Show recent calculations."""
+    limit = arguments.get("limit", 10)
+    if limit > 0:
+        # Walk back from the newest entry so only `limit` items are touched
+        recent = list(itertools.islice(reversed(calculation_history), limit))
+        recent.reverse()
+    else:
+        # Keep slice semantics: 0 shows everything, -n skips the oldest n
+        recent = list(calculation_history)[-limit:]
+    
+    if not recent:
+        return [TextContent(type="text", text="No calculation history")]
+    
+    history_text = "Recent calculations:\n" + "\n".join(recent)
+    return [TextContent(type="text", text=history_text)]
+
+_HANDLERS = {
+    "calculate": _handle_calculate,
+    "scientific_calc": _handle_scientific_calc,
+    "statistics": _handle_statistics,
+    "unit_convert": _handle_unit_convert,
+    "history": _handle_history
+}
+
 @server.call_tool()
 async def call_tool(name: str, arguments: dict):
     """Execute calculator tools."""
-    global last_result, calculation_history
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
     
     try:
-        if name == "calculate":
-            expression = arguments["expression"]
-            
-            # Replace 'ans' with last result
-            if "ans" in expression.lower():
-                expression = expression.lower().replace("ans", str(last_result))
-            
-            result = safe_eval(expression)
-            last_result = result
-            
-            # Add to history
-            history_entry = f"{expression} = {result}"
-            calculation_history.append(history_entry)
-            
-            return [TextContent(
-                type="text",
-                text=f"{history_entry}"
-            )]
-        
-        elif name == "scientific_calc":
-            operation = arguments["operation"]
-            value = float(arguments["value"])
-            
-            if operation == "sin":
-                result = math.sin(math.radians(value))
-            elif operation == "cos":
-                result = math.cos(math.radians(value))
-            elif operation == "tan":
-                result = math.tan(math.radians(value))
-            elif operation == "log":
-                base = float(arguments.get("base", 10))
-                result = math.log(value, base)
-            elif operation == "ln":
-                result = math.log(value)
-            elif operation == "sqrt":
-                result = math.sqrt(value)
-            elif operation == "pow":
-                base = float(arguments.get("base", 2))
-                result = math.pow(value, base)
-            elif operation == "factorial":
-                result = math.factorial(int(value))
-            else:
-                return [TextContent(type="text", text=f"Unknown operation: {operation}")]
-            
-            last_result = result
-            history_entry = f"{operation}({value}) = {result}"
-            calculation_history.append(history_entry)
-            
-            return [TextContent(type="text", text=history_entry)]
-        
-        elif name == "statistics":
-            numbers = arguments["numbers"]
-            operation = arguments["operation"]
-            
-            if not numbers:
-                return [TextContent(type="text", text="No numbers provided")]
-            
-            if operation == "mean":
-                result = sum(numbers) / len(numbers)
-            elif operation == "median":
-                sorted_nums = sorted(numbers)
-                n = len(sorted_nums)
-                if n % 2 == 0:
-                    result = (sorted_nums[n//2-1] + sorted_nums[n//2]) / 2
-                else:
-                    result = sorted_nums[n//2]
-            elif operation == "mode":
-                from collections import Counter
-                counts = Counter(numbers)
-                max_count = max(counts.values())
-                modes = [k for k, v in counts.items() if v == max_count]
-                result = modes[0] if len(modes) == 1 else modes
-            elif operation == "std_dev":
-                mean = sum(numbers) / len(numbers)
-                variance = sum((x - mean) ** 2 for x in numbers) / len(numbers)
-                result = math.sqrt(variance)
-            elif operation == "sum":
-                result = sum(numbers)
-            else:
-                return [TextContent(type="text", text=f"Unknown operation: {operation}")]
-            
-            return [TextContent(
-                type="text",
-                text=f"{operation} of {numbers} = {result}"
-            )]
-        
-        elif name == "unit_convert":
-            value = float(arguments["value"])
-            from_unit = arguments["from_unit"].lower()
-            to_unit = arguments["to_unit"].lower()
-            
-            # Distance conversions
-            conversions = {
-                ("km", "miles"): lambda x: x * 0.621371,
-                ("miles", "km"): lambda x: x * 1.60934,
-                ("m", "ft"): lambda x: x * 3.28084,
-                ("ft", "m"): lambda x: x / 3.28084,
-                ("celsius", "fahrenheit"): lambda x: x * 9/5 + 32,
-                ("fahrenheit", "celsius"): lambda x: (x - 32) * 5/9,
-                ("kg", "lbs"): lambda x: x * 2.20462,
-                ("lbs", "kg"): lambda x: x / 2.20462,
-            }
-            
-            key = (from_unit, to_unit)
-            if key in conversions:
-                result = conversions[key](value)
-                return [TextContent(
-                    type="text",
-                    text=f"{value} {from_unit} = {result:.4f} {to_unit}"
-                )]
-            else:
-                return [TextContent(
-                    type="text",
-                    text=f"Conversion from {from_unit} to {to_unit} not supported"
-                )]
-        
-        elif name == "history":
-            limit = arguments.get("limit", 10)
-            recent = calculation_history[-limit:] if calculation_history else []
-            
-            if not recent:
-                return [TextContent(type="text", text="No calculation history")]
-            
-            history_text = "Recent calculations:\n" + "\n".join(recent)
-            return [TextContent(type="text", text=history_text)]
-        
-        else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
-            
+        return await handler(arguments)
     except Exception as e:
         return [TextContent(
             type="text",
@@ -4,27 +4,71 @@ MCP server providing demo data generation and manipulation.
 """
 
 import asyncio
+import bisect
 import json
+import operator
 import random
 import string
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent, Resource
 
+try:
+    import orjson
+    
+    def _dumps(obj: Any, indent: bool = False) -> str:
+        """Serialize to JSON text with the C-implemented orjson encoder."""
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+except ImportError:
+    # json.dumps(indent=2) constructs a new JSONEncoder on every call
+    _indent_encoder = json.JSONEncoder(indent=2)
+    
+    def _dumps(obj: Any, indent: bool = False) -> str:
+        """Serialize to JSON text with the stdlib encoder."""
+        return _indent_encoder.encode(obj) if indent else json.dumps(obj)
+
 # Create server instance
 server = Server("data-server")
 
 # Sample data storage
 data_store: Dict[str, List[Dict[str, Any]]] = {}
 
+# Sorted views per (collection, field): sort keys, items, and whether every
+# item has the field. Built on first use and dropped when the collection changes.
+_sorted_indexes: Dict[Tuple[str, str], Tuple[List[Any], List[Dict[str, Any]], bool]] = {}
+_SORTED_INDEX_CACHE_SIZE = 16
+
+# Serialized responses per collection, tagged with the id() of the list they
+# were built from. Dropped when the collection changes.
+_json_cache: Dict[str, Tuple[int, str]] = {}
+_query_cache: Dict[str, Tuple[int, Dict[str, str]]] = {}
+_QUERY_CACHE_SIZE = 64
+
+# Results of sum/avg/min/max per (collection, operation, field), computed on
+# first request and dropped when the collection changes
+_aggregates: Dict[Tuple[str, str, str], Any] = {}
+
 # Predefined data templates
 FIRST_NAMES = ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry", "Iris", "Jack"]
 LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Wilson", "Martinez"]
 CITIES = ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia", "San Antonio", "San Diego", "Dallas", "Austin"]
 PRODUCTS = ["Laptop", "Phone", "Tablet", "Monitor", "Keyboard", "Mouse", "Headphones", "Camera", "Printer", "Speaker"]
 DEPARTMENTS = ["Engineering", "Sales", "Marketing", "HR", "Finance", "Operations", "Support", "Research", "Legal", "Admin"]
+PRODUCT_TIERS = ["Pro", "Ultra", "Mini", "Max", "Plus"]
+CATEGORIES = ["Electronics", "Accessories", "Computing", "Audio"]
+EMAIL_DOMAINS = ("email.com", "mail.co", "inbox.net", "post.org")
+TRANSACTION_STATUSES = ["completed", "pending", "shipped"]
+
+# Integer ranges for random.choices (inclusive bounds, like randint)
+AGE_RANGE = range(22, 66)
+SALARY_RANGE = range(40000, 150001)
+STOCK_RANGE = range(0, 101)
+QUANTITY_RANGE = range(1, 6)
 
 @server.list_resources()
 async def list_resources():
@@ -47,7 +91,10 @@ async def read_resource(uri: str):
     collection_name = uri.replace("data://", "")
     if collection_name in data_store:
         data = data_store[collection_name]
-        return json.dumps(data, indent=2)
+        cached = _json_cache.get(collection_name)
+        if cached is None or cached[0] != id(data):
+            cached = _json_cache[collection_name] = (id(data), _dumps(data, indent=True))
+        return cached[1]
     else:
         return f"Collection '{collection_name}' not found"
 
@@ -188,214 +235,347 @@ async def list_tools():
         )
     ]
 
-def generate_email(first_name: str, last_name: str) -> str:
-    """Generate email from name."""
-    domains = ["email.com", "mail.co", "inbox.net", "post.org"]
-    return f"{first_name.lower()}.{last_name.lower()}@{random.choice(domains)}"
+def generate_email(first_name: str, last_name: str, domain: Optional[str] = None) -> str:
+    """Generate email from name, picking a random domain if none is given."""
+    if domain is None:
+        domain = random.choice(EMAIL_DOMAINS)
+    return f"{first_name.lower()}.{last_name.lower()}@{domain}"
+
+def _uniform_batch(low: float, high: float, count: int, ndigits: int) -> List[float]:
+    """Draw count rounded uniform values in [low, high]."""
+    span = high - low
+    rand = random.random
+    return [round(low + span * rand(), ndigits) for _ in range(count)]
+
+_FILTER_OPS = {
+    "$gt": operator.gt,
+    "$lt": operator.lt,
+    "$gte": operator.ge,
+    "$lte": operator.le,
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+}
 
-def apply_filter(item: Dict, filter_criteria: Dict) -> bool:
-    """Apply MongoDB-style filter to item."""
-    for field, condition in filter_criteria.items():
+def _field_predicate(field: str, op: Callable[[Any, Any], bool], value: Any) -> Callable[[Dict], bool]:
+    def predicate(item: Dict) -> bool:
+        return op(item.get(field), value)
+    return predicate
+
+@lru_cache(maxsize=128)
+def _compile_filter(criteria_json: str) -> Callable[[Dict], bool]:
+    predicates = []
+    for field, condition in json.loads(criteria_json).items():
         if isinstance(condition, dict):
             for op, value in condition.items():
-                item_value = item.get(field)
-                if op == "$gt" and not (item_value > value):
-                    return False
-                elif op == "$lt" and not (item_value < value):
-                    return False
-                elif op == "$gte" and not (item_value >= value):
-                    return False
-                elif op == "$lte" and not (item_value <= value):
-                    return False
-                elif op == "$eq" and not (item_value == value):
-                    return False
-                elif op == "$ne" and not (item_value != value):
-                    return False
+                if op in _FILTER_OPS:
+                    predicates.append(_field_predicate(field, _FILTER_OPS[op], value))
         else:
-            if item.get(field) != condition:
+            predicates.append(_field_predicate(field, operator.eq, condition))
+    
+    if len(predicates) == 1:
+        return predicates[0]
+    
+    def matches(item: Dict) -> bool:
+        for predicate in predicates:
+            if not predicate(item):
                 return False
-    return True
+        return True
+    return matches
+
+def compile_filter(filter_criteria: Dict) -> Callable[[Dict], bool]:
+    """Compile a MongoDB-style filter into a predicate, once per distinct filter."""
+    # Keys keep their original order so conditions are checked in the order given
+    return _compile_filter(json.dumps(filter_criteria))
+
+def _invalidate_collection(collection: str) -> None:
+    """Drop cached views of a collection after it is replaced or cleared."""
+    for cache in (_sorted_indexes, _aggregates):
+        for key in [key for key in cache if key[0] == collection]:
+            del cache[key]
+    _json_cache.pop(collection, None)
+    _query_cache.pop(collection, None)
+
+def _field_aggregate(collection: str, operation: str, field: str) -> Any:
+    """Return sum/avg/min/max of a field, scanning the collection once per change."""
+    key = (collection, operation, field)
+    if key in _aggregates:
+        return _aggregates[key]
+    
+    # Single pass over the collection, no intermediate list
+    values = (item[field] for item in data_store[collection] if field in item)
+    if operation == "sum":
+        result = sum(values)
+    elif operation == "avg":
+        total = 0
+        n = 0
+        for value in values:
+            total += value
+            n += 1
+        result = total / n if n else 0
+    elif operation == "min":
+        result = min(values, default=0)
+    else:
+        result = max(values, default=0)
+    
+    _aggregates[key] = result
+    return result
+
+def _cached_queries(collection: str) -> Dict[str, str]:
+    """Serialized query results for the collection's current contents."""
+    data_id = id(data_store[collection])
+    cached = _query_cache.get(collection)
+    if cached is None or cached[0] != data_id or len(cached[1]) >= _QUERY_CACHE_SIZE:
+        cached = _query_cache[collection] = (data_id, {})
+    return cached[1]
+
+def _sorted_index(collection: str, field: str) -> Tuple[List[Any], List[Dict[str, Any]], bool]:
+    """Return the collection sorted by field, building the index on first use."""
+    index = _sorted_indexes.get((collection, field))
+    if index is None:
+        data = data_store[collection]
+        # A field no item has leaves the order unchanged; don't cache it
+        if not any(field in item for item in data):
+            return [], data, False
+        if len(_sorted_indexes) >= _SORTED_INDEX_CACHE_SIZE:
+            del _sorted_indexes[next(iter(_sorted_indexes))]
+        items = sorted(data, key=lambda x: x.get(field, 0))
+        keys = [item.get(field, 0) for item in items]
+        complete = all(field in item for item in items)
+        index = _sorted_indexes[(collection, field)] = (keys, items, complete)
+    return index
+
+def _range_bounds(keys: List[Any], condition: Dict[str, Any]) -> Tuple[int, int]:
+    """Narrow sorted keys to the slice that can satisfy range operators."""
+    lo, hi = 0, len(keys)
+    for op, value in condition.items():
+        if op == "$gt":
+            lo = max(lo, bisect.bisect_right(keys, value))
+        elif op == "$gte":
+            lo = max(lo, bisect.bisect_left(keys, value))
+        elif op == "$lt":
+            hi = min(hi, bisect.bisect_left(keys, value))
+        elif op == "$lte":
+            hi = min(hi, bisect.bisect_right(keys, value))
+    return lo, hi
+
+async def _handle_generate_users(arguments: dict):
+    """Generate sample users."""
+    count = arguments.get("count", 10)
+    fields = arguments.get("include_fields", ["name", "email", "age", "city"])
+    
+    # Draw each field in one batch, then fill the records column by column
+    firsts = random.choices(FIRST_NAMES, k=count)
+    lasts = random.choices(LAST_NAMES, k=count)
+    columns = []
+    if "name" in fields:
+        columns.append(("name", [f"{first} {last}" for first, last in zip(firsts, lasts)]))
+    if "email" in fields:
+        domains = random.choices(EMAIL_DOMAINS, k=count)
+        columns.append(("email", [
+            generate_email(first, last, domain)
+            for first, last, domain in zip(firsts, lasts, domains)
+        ]))
+    if "age" in fields:
+        columns.append(("age", random.choices(AGE_RANGE, k=count)))
+    if "city" in fields:
+        columns.append(("city", random.choices(CITIES, k=count)))
+    if "department" in fields:
+        columns.append(("department", random.choices(DEPARTMENTS, k=count)))
+    if "salary" in fields:
+        columns.append(("salary", random.choices(SALARY_RANGE, k=count)))
+    
+    users = [{"id": i + 1} for i in range(count)]
+    for field, values in columns:
+        for user, value in zip(users, values):
+            user[field] = value
+    
+    data_store["users"] = users
+    _invalidate_collection("users")
+    return [TextContent(
+        type="text",
+        text=f"Generated {count} users with fields: {', '.join(fields)}"
+    )]
+
+async def _handle_generate_products(arguments: dict):
+    """Generate sample products."""
+    count = arguments.get("count", 10)
+    price_range = arguments.get("price_range", {"min": 10, "max": 1000})
+    
+    products = [
+        {
+            "id": i + 1,
+            "name": f"{tier} {product}",
+            "price": price,
+            "stock": stock,
+            "category": category,
+            "rating": rating
+        }
+        for i, (tier, product, price, stock, category, rating) in enumerate(zip(
+            random.choices(PRODUCT_TIERS, k=count),
+            random.choices(PRODUCTS, k=count),
+            _uniform_batch(price_range["min"], price_range["max"], count, 2),
+            random.choices(STOCK_RANGE, k=count),
+            random.choices(CATEGORIES, k=count),
+            _uniform_batch(3.0, 5.0, count, 1)
+        ))
+    ]
+    
+    data_store["products"] = products
+    _invalidate_collection("products")
+    return [TextContent(
+        type="text",
+        text=f"Generated {count} products with prices ${price_range['min']}-${price_range['max']}"
+    )]
+
+async def _handle_generate_transactions(arguments: dict):
+    """Generate transactions between existing users and products."""
+    count = arguments.get("count", 20)
+    days_back = arguments.get("days_back", 30)
+    
+    # Need users and products
+    if "users" not in data_store or "products" not in data_store:
+        return [TextContent(
+            type="text",
+            text="Please generate users and products first"
+        )]
+    
+    start_date = datetime.now() - timedelta(days=days_back)
+    
+    # Draw every random field in one batch per field
+    users = random.choices(data_store["users"], k=count)
+    products = random.choices(data_store["products"], k=count)
+    quantities = random.choices(QUANTITY_RANGE, k=count)
+    offsets = random.choices(range(days_back + 1), k=count)
+    statuses = random.choices(TRANSACTION_STATUSES, k=count)
+    
+    # At most days_back + 1 distinct dates, so format each one only once
+    dates = {offset: (start_date + timedelta(days=offset)).isoformat() for offset in set(offsets)}
+    
+    transactions = [
+        {
+            "id": i + 1,
+            "user_id": user["id"],
+            "user_name": user.get("name", "Unknown"),
+            "product_id": product["id"],
+            "product_name": product["name"],
+            "quantity": quantity,
+            "price": product["price"],
+            "total": round(product["price"] * quantity, 2),
+            "date": dates[offset],
+            "status": status
+        }
+        for i, (user, product, quantity, offset, status) in enumerate(
+            zip(users, products, quantities, offsets, statuses)
+        )
+    ]
+    
+    data_store["transactions"] = transactions
+    _invalidate_collection("transactions")
+    return [TextContent(
+        type="text",
+        text=f"Generated {count} transactions over the last {days_back} days"
+    )]
+
+async def _handle_query_data(arguments: dict):
+    """Filter, sort and limit a collection."""
+    collection = arguments["collection"]
+    if collection not in data_store:
+        return [TextContent(type="text", text=f"Collection '{collection}' not found")]
+    
+    criteria = arguments.get("filter")
+    sort_by = arguments.get("sort_by")
+    limit = arguments.get("limit", 10)
+    
+    # Repeated queries against unchanged data reuse the serialized result
+    queries = _cached_queries(collection)
+    query_key = json.dumps([criteria, sort_by, limit])
+    if query_key in queries:
+        return [TextContent(type="text", text=queries[query_key])]
+    
+    data = data_store[collection]
+    
+    # Sort using the cached index; a range filter on the sort field
+    # is answered by bisecting it instead of scanning every item
+    if sort_by:
+        keys, data, complete = _sorted_index(collection, sort_by)
+        if criteria and complete and isinstance(criteria.get(sort_by), dict):
+            lo, hi = _range_bounds(keys, criteria[sort_by])
+            data = data[lo:hi]
+    
+    # Apply filter
+    if criteria:
+        matches = compile_filter(criteria)
+        data = [item for item in data if matches(item)]
+    
+    # Limit
+    data = data[:limit]
+    
+    text = queries[query_key] = _dumps(data, indent=True)
+    return [TextContent(type="text", text=text)]
+
+async def _handle_aggregate_data(arguments: dict):
+    """Run an aggregation over a collection."""
+    collection = arguments["collection"]
+    if collection not in data_store:
+        return [TextContent(type="text", text=f"Collection '{collection}' not found")]
+    
+    data = data_store[collection]
+    operation = arguments["operation"]
+    field = arguments.get("field")
+    
+    if operation == "count":
+        result = len(data)
+    
+    elif operation in ["sum", "avg", "min", "max"] and field:
+        result = _field_aggregate(collection, operation, field)
+    
+    elif operation == "group_by":
+        group_field = arguments.get("group_field")
+        if not group_field:
+            return [TextContent(type="text", text="group_field required for group_by")]
+        
+        # Only counts are returned, so tally keys without building groups
+        try:
+            result = dict(Counter(map(operator.itemgetter(group_field), data)))
+        except KeyError:
+            result = dict(Counter(item.get(group_field, "Unknown") for item in data))
+    
+    else:
+        return [TextContent(type="text", text=f"Invalid operation or missing field")]
+    
+    return [TextContent(
+        type="text",
+        text=f"{operation} result: {_dumps(result, indent=True)}"
+    )]
+
+async def _handle_clear_data(arguments: dict):
+    """Remove a collection."""
+    collection = arguments["collection"]
+    if collection in data_store:
+        del data_store[collection]
+        _invalidate_collection(collection)
+        return [TextContent(type="text", text=f"Cleared collection '{collection}'")]
+    else:
+        return [TextContent(type="text", text=f"Collection '{collection}' not found")]
+
+_HANDLERS = {
+    "generate_users": _handle_generate_users,
+    "generate_products": _handle_generate_products,
+    "generate_transactions": _handle_generate_transactions,
+    "query_data": _handle_query_data,
+    "aggregate_data": _handle_aggregate_data,
+    "clear_data": _handle_clear_data
+}
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict):
     """Execute data tools."""
-    global data_store
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
     
     try:
-        if name == "generate_users":
-            count = arguments.get("count", 10)
-            fields = arguments.get("include_fields", ["name", "email", "age", "city"])
-            
-            users = []
-            for i in range(count):
-                first = random.choice(FIRST_NAMES)
-                last = random.choice(LAST_NAMES)
-                user = {"id": i + 1}
-                
-                if "name" in fields:
-                    user["name"] = f"{first} {last}"
-                if "email" in fields:
-                    user["email"] = generate_email(first, last)
-                if "age" in fields:
-                    user["age"] = random.randint(22, 65)
-                if "city" in fields:
-                    user["city"] = random.choice(CITIES)
-                if "department" in fields:
-                    user["department"] = random.choice(DEPARTMENTS)
-                if "salary" in fields:
-                    user["salary"] = random.randint(40000, 150000)
-                
-                users.append(user)
-            
-            data_store["users"] = users
-            return [TextContent(
-                type="text",
-                text=f"Generated {count} users with fields: {', '.join(fields)}"
-            )]
-        
-        elif name == "generate_products":
-            count = arguments.get("count", 10)
-            price_range = arguments.get("price_range", {"min": 10, "max": 1000})
-            
-            products = []
-            for i in range(count):
-                product = {
-                    "id": i + 1,
-                    "name": f"{random.choice(['Pro', 'Ultra', 'Mini', 'Max', 'Plus'])} {random.choice(PRODUCTS)}",
-                    "price": round(random.uniform(price_range["min"], price_range["max"]), 2),
-                    "stock": random.randint(0, 100),
-                    "category": random.choice(["Electronics", "Accessories", "Computing", "Audio"]),
-                    "rating": round(random.uniform(3.0, 5.0), 1)
-                }
-                products.append(product)
-            
-            data_store["products"] = products
-            return [TextContent(
-                type="text",
-                text=f"Generated {count} products with prices ${price_range['min']}-${price_range['max']}"
-            )]
-        
-        elif name == "generate_transactions":
-            count = arguments.get("count", 20)
-            days_back = arguments.get("days_back", 30)
-            
-            # Need users and products
-            if "users" not in data_store or "products" not in data_store:
-                return [TextContent(
-                    type="text",
-                    text="Please generate users and products first"
-                )]
-            
-            transactions = []
-            start_date = datetime.now() - timedelta(days=days_back)
-            
-            for i in range(count):
-                user = random.choice(data_store["users"])
-                product = random.choice(data_store["products"])
-                quantity = random.randint(1, 5)
-                
-                transaction = {
-                    "id": i + 1,
-                    "user_id": user["id"],
-                    "user_name": user.get("name", "Unknown"),
-                    "product_id": product["id"],
-                    "product_name": product["name"],
-                    "quantity": quantity,
-                    "price": product["price"],
-                    "total": round(product["price"] * quantity, 2),
-                    "date": (start_date + timedelta(days=random.randint(0, days_back))).isoformat(),
-                    "status": random.choice(["completed", "pending", "shipped"])
-                }
-                transactions.append(transaction)
-            
-            data_store["transactions"] = transactions
-            return [TextContent(
-                type="text",
-                text=f"Generated {count} transactions over the last {days_back} days"
-            )]
-        
-        elif name == "query_data":
-            collection = arguments["collection"]
-            if collection not in data_store:
-                return [TextContent(type="text", text=f"Collection '{collection}' not found")]
-            
-            data = data_store[collection]
-            
-            # Apply filter
-            if "filter" in arguments and arguments["filter"]:
-                data = [item for item in data if apply_filter(item, arguments["filter"])]
-            
-            # Sort
-            if "sort_by" in arguments and arguments["sort_by"]:
-                data = sorted(data, key=lambda x: x.get(arguments["sort_by"], 0))
-            
-            # Limit
-            limit = arguments.get("limit", 10)
-            data = data[:limit]
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(data, indent=2)
-            )]
-        
-        elif name == "aggregate_data":
-            collection = arguments["collection"]
-            if collection not in data_store:
-                return [TextContent(type="text", text=f"Collection '{collection}' not found")]
-            
-            data = data_store[collection]
-            operation = arguments["operation"]
-            field = arguments.get("field")
-            
-            if operation == "count":
-                result = len(data)
-            
-            elif operation in ["sum", "avg", "min", "max"] and field:
-                values = [item.get(field, 0) for item in data if field in item]
-                if not values:
-                    result = 0
-                elif operation == "sum":
-                    result = sum(values)
-                elif operation == "avg":
-                    result = sum(values) / len(values)
-                elif operation == "min":
-                    result = min(values)
-                elif operation == "max":
-                    result = max(values)
-            
-            elif operation == "group_by":
-                group_field = arguments.get("group_field")
-                if not group_field:
-                    return [TextContent(type="text", text="group_field required for group_by")]
-                
-                groups = {}
-                for item in data:
-                    key = item.get(group_field, "Unknown")
-                    if key not in groups:
-                        groups[key] = []
-                    groups[key].append(item)
-                
-                result = {k: len(v) for k, v in groups.items()}
-            
-            else:
-                return [TextContent(type="text", text=f"Invalid operation or missing field")]
-            
-            return [TextContent(
-                type="text",
-                text=f"{operation} result: {json.dumps(result, indent=2)}"
-            )]
-        
-        elif name == "clear_data":
-            collection = arguments["collection"]
-            if collection in data_store:
-                del data_store[collection]
-                return [TextContent(type="text", text=f"Cleared collection '{collection}'")]
-            else:
-                return [TextContent(type="text", text=f"Collection '{collection}' not found")]
-        
-        else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
-            
+        return await handler(arguments)
     except Exception as e:
         return [TextContent(
             type="text",
@@ -5,8 +5,10 @@ This server can add/remove tools at runtime to test change notifications.
 """
 
 import asyncio
+import functools
 import json
 import sys
+import time
 from typing import Dict, List, Any
 from datetime import datetime
 
@@ -18,11 +20,85 @@ except ImportError:
     print("Error: MCP library not installed. Run: pip install mcp", file=sys.stderr)
     sys.exit(1)
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        """Serialize to JSON text with the C-implemented orjson encoder."""
+        return orjson.dumps(obj).decode()
+    
+    def _tool_ok(name: str, message: str) -> str:
+        """Success reply for a tool change."""
+        return _dumps({"success": True, "tool": name, "message": message})
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        """Serialize to JSON text with the stdlib encoder."""
+        return json.dumps(obj)
+    
+    def _tool_ok(name: str, message: str) -> str:
+        """Success reply for a tool change, escaping only the string values."""
+        # Same text as json.dumps of the dict, without walking it
+        return '{"success": true, "tool": %s, "message": %s}' % (json.dumps(name), json.dumps(message))
+
+# Upper bound on progress notifications sent by long_running_task
+MAX_PROGRESS_STEPS = 10
+
+# Constant response, serialized once
+_RESOURCE_CHANGED_RESPONSE = _dumps({
+    "success": True,
+    "message": "Resource change notification sent"
+})
+
+# Most recent timestamp as [epoch milliseconds, ISO string]
+_last_timestamp = [0, ""]
+
+
+def _now_iso() -> str:
+    """Current local time in ISO format with millisecond precision."""
+    # Millisecond output matches the cache key, so a reused string is never stale
+    millis = int(time.time() * 1000)
+    if millis != _last_timestamp[0]:
+        _last_timestamp[0] = millis
+        _last_timestamp[1] = datetime.fromtimestamp(millis / 1000).isoformat(timespec="milliseconds")
+    return _last_timestamp[1]
+
+
+async def _dynamic_handler(name: str, /, **kwargs) -> str:
+    """Handle a call to a dynamically added tool; bound to a name with partial."""
+    return _dumps({
+        "tool": name,
+        "input": kwargs,
+        "result": f"Executed {name} with {kwargs}",
+        "timestamp": _now_iso()
+    })
+
 
 class DynamicServer:
     def __init__(self):
         self.server = Server("dynamic-server")
         self.custom_tools: Dict[str, Tool] = {}
+        # get_server_info only updates the tool count and timestamp per call
+        self._info_template: Dict[str, Any] = {
+            "name": "dynamic-server",
+            "version": "1.0.0",
+            "capabilities": {
+                "tools": {
+                    "base_tools": 6,
+                    "dynamic_tools": 0
+                },
+                "notifications": [
+                    "tools_changed",
+                    "resources_changed",
+                    "progress"
+                ]
+            },
+            "timestamp": None
+        }
         self._setup_base_tools()
         
     def _setup_base_tools(self):
@@ -32,27 +108,15 @@ class DynamicServer:
         async def list_dynamic_tools() -> str:
             """List all dynamically added tools."""
             tools = list(self.custom_tools.keys())
-            return json.dumps({
+            return _dumps({
                 "dynamic_tools": tools,
                 "count": len(tools),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             })
         
         @self.server.tool()
         async def add_tool(name: str, description: str = "Dynamic tool") -> str:
             """Add a new tool dynamically."""
-            if name in self.custom_tools:
-                return json.dumps({"error": f"Tool '{name}' already exists"})
-            
-            # Create a dynamic tool
-            async def dynamic_handler(**kwargs) -> str:
-                return json.dumps({
-                    "tool": name,
-                    "input": kwargs,
-                    "result": f"Executed {name} with {kwargs}",
-                    "timestamp": datetime.now().isoformat()
-                })
-            
             # Register the tool
             tool = Tool(
                 name=name,
@@ -63,59 +127,54 @@ class DynamicServer:
                         "data": {"type": "string", "description": "Input data"}
                     }
                 },
-                handler=dynamic_handler
+                handler=functools.partial(_dynamic_handler, name)
             )
             
-            self.custom_tools[name] = tool
+            # Insert-or-detect in a single dict operation
+            if self.custom_tools.setdefault(name, tool) is not tool:
+                return _dumps({"error": f"Tool '{name}' already exists"})
             self.server._tools[name] = tool
             
             # Send tools changed notification
             await self.server.send_tools_changed_notification()
             
-            return json.dumps({
-                "success": True,
-                "tool": name,
-                "message": f"Tool '{name}' added successfully"
-            })
+            return _tool_ok(name, f"Tool '{name}' added successfully")
         
         @self.server.tool()
         async def remove_tool(name: str) -> str:
             """Remove a dynamically added tool."""
-            if name not in self.custom_tools:
-                return json.dumps({"error": f"Tool '{name}' not found or is not removable"})
-            
             # Remove the tool
-            del self.custom_tools[name]
-            del self.server._tools[name]
+            if self.custom_tools.pop(name, None) is None:
+                return _dumps({"error": f"Tool '{name}' not found or is not removable"})
+            self.server._tools.pop(name, None)
             
             # Send tools changed notification
             await self.server.send_tools_changed_notification()
             
-            return json.dumps({
-                "success": True,
-                "tool": name,
-                "message": f"Tool '{name}' removed successfully"
-            })
+            return _tool_ok(name, f"Tool '{name}' removed successfully")
         
         @self.server.tool()
         async def long_running_task(duration: int = 5, with_progress: bool = True) -> str:
             """Execute a long-running task with optional progress updates."""
             if with_progress:
-                # Send progress notifications
-                for i in range(duration):
-                    progress = (i + 1) / duration
+                # Send progress notifications, one per second up to
+                # MAX_PROGRESS_STEPS, then spread evenly over the duration
+                steps = min(duration, MAX_PROGRESS_STEPS)
+                suffix = f" of {steps}"
+                for i in range(steps):
+                    progress = (i + 1) / steps
                     await self.server.send_progress_notification(
                         progress=progress,
-                        message=f"Processing step {i + 1} of {duration}"
+                        message=f"Processing step {i + 1}{suffix}"
                     )
-                    await asyncio.sleep(1)
+                    await asyncio.sleep(duration / steps)
             else:
                 await asyncio.sleep(duration)
             
-            return json.dumps({
+            return _dumps({
                 "completed": True,
                 "duration": duration,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             })
         
         @self.server.tool()
@@ -124,30 +183,15 @@ class DynamicServer:
             # Send resource changed notification
             await self.server.send_resources_changed_notification()
             
-            return json.dumps({
-                "success": True,
-                "message": "Resource change notification sent"
-            })
+            return _RESOURCE_CHANGED_RESPONSE
         
         @self.server.tool()
         async def get_server_info() -> str:
             """Get information about the server."""
-            return json.dumps({
-                "name": "dynamic-server",
-                "version": "1.0.0",
-                "capabilities": {
-                    "tools": {
-                        "base_tools": 6,
-                        "dynamic_tools": len(self.custom_tools)
-                    },
-                    "notifications": [
-                        "tools_changed",
-                        "resources_changed",
-                        "progress"
-                    ]
-                },
-                "timestamp": datetime.now().isoformat()
-            })
+            info = self._info_template
+            info["capabilities"]["tools"]["dynamic_tools"] = len(self.custom_tools)
+            info["timestamp"] = _now_iso()
+            return _dumps(info)
     
     async def run(self):
         """Run the server."""
@@ -163,7 +207,10 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\nShutting down dynamic server...", file=sys.stderr)
     except Exception as e:
@@ -5,12 +5,19 @@ Simple MCP server that provides time and date functionality.
 
 import asyncio
 import json
-from datetime import datetime, timezone
-import pytz
+import time
+from datetime import datetime, timezone, tzinfo
+from typing import Dict, Tuple
+from zoneinfo import ZoneInfo
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Create server instance
 server = Server("time-server")
 
@@ -27,197 +34,271 @@ TIMEZONES = {
     "AEST": "Australia/Sydney"
 }
 
-@server.list_tools()
-async def list_tools():
-    """List available time/date tools."""
-    return [
-        Tool(
-            name="get_current_time",
-            description="Get current time in specified timezone",
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "timezone": {
-                        "type": "string",
-                        "description": f"Timezone code: {', '.join(TIMEZONES.keys())}",
-                        "default": "UTC"
-                    },
-                    "format": {
-                        "type": "string", 
-                        "description": "Time format: '12h' or '24h'",
-                        "default": "24h"
-                    }
+# tzinfo objects for each code, built once at import
+TZ_OBJECTS = {code: ZoneInfo(name) for code, name in TIMEZONES.items()}
+_UTC = TZ_OBJECTS["UTC"]
+
+# Code list shown in tool descriptions
+_TZ_KEYS = ', '.join(TIMEZONES)
+
+# strftime formats by requested format; anything else gets the default
+_TIME_FORMATS = {"12h": "%I:%M:%S %p"}
+_DEFAULT_TIME_FORMAT = "%H:%M:%S"
+_DATE_FORMATS = {"us": "%m/%d/%Y", "eu": "%d/%m/%Y"}
+_DEFAULT_DATE_FORMAT = "%Y-%m-%d"  # iso
+_CONVERTED_TIME_FORMAT = "%H:%M"
+
+# Formatted current time per (zone, strftime format), tagged with the
+# wall-clock second it was rendered for
+_time_cache: Dict[Tuple[tzinfo, str], Tuple[int, str]] = {}
+
+# Tool definitions never change, so build them once and reuse them
+_TOOLS_LIST = [
+    Tool(
+        name="get_current_time",
+        description="Get current time in specified timezone",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "timezone": {
+                    "type": "string",
+                    "description": f"Timezone code: {_TZ_KEYS}",
+                    "default": "UTC"
+                },
+                "format": {
+                    "type": "string", 
+                    "description": "Time format: '12h' or '24h'",
+                    "default": "24h"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="get_date",
+        description="Get current date in specified timezone",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "timezone": {
+                    "type": "string",
+                    "description": f"Timezone code: {_TZ_KEYS}",
+                    "default": "UTC"
+                },
+                "format": {
+                    "type": "string",
+                    "description": "Date format: 'iso', 'us', 'eu'",
+                    "default": "iso"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="time_until",
+        description="Calculate time until a future date",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "target_date": {
+                    "type": "string",
+                    "description": "Target date in YYYY-MM-DD format"
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_date",
-            description="Get current date in specified timezone",
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "timezone": {
-                        "type": "string",
-                        "description": f"Timezone code: {', '.join(TIMEZONES.keys())}",
-                        "default": "UTC"
-                    },
-                    "format": {
-                        "type": "string",
-                        "description": "Date format: 'iso', 'us', 'eu'",
-                        "default": "iso"
-                    }
+                "target_time": {
+                    "type": "string",
+                    "description": "Target time in HH:MM format (24h)",
+                    "default": "00:00"
                 },
-                "required": []
-            }
-        ),
-        Tool(
-            name="time_until",
-            description="Calculate time until a future date",
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "target_date": {
-                        "type": "string",
-                        "description": "Target date in YYYY-MM-DD format"
-                    },
-                    "target_time": {
-                        "type": "string",
-                        "description": "Target time in HH:MM format (24h)",
-                        "default": "00:00"
-                    },
-                    "timezone": {
-                        "type": "string",
-                        "description": f"Timezone code: {', '.join(TIMEZONES.keys())}",
-                        "default": "UTC"
-                    }
+                "timezone": {
+                    "type": "string",
+                    "description": f"Timezone code: {_TZ_KEYS}",
+                    "default": "UTC"
+                }
+            },
+            "required": ["target_date"]
+        }
+    ),
+    Tool(
+        name="timezone_converter",
+        description="Convert time between timezones",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "time": {
+                    "type": "string",
+                    "description": "Time in HH:MM format (24h)"
                 },
-                "required": ["target_date"]
-            }
-        ),
-        Tool(
-            name="timezone_converter",
-            description="Convert time between timezones",
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "time": {
-                        "type": "string",
-                        "description": "Time in HH:MM format (24h)"
-                    },
-                    "from_timezone": {
-                        "type": "string",
-                        "description": f"Source timezone: {', '.join(TIMEZONES.keys())}"
-                    },
-                    "to_timezone": {
-                        "type": "string",
-                        "description": f"Target timezone: {', '.join(TIMEZONES.keys())}"
-                    }
+                "from_timezone": {
+                    "type": "string",
+                    "description": f"Source timezone: {_TZ_KEYS}"
                 },
-                "required": ["time", "from_timezone", "to_timezone"]
-            }
-        )
-    ]
+                "to_timezone": {
+                    "type": "string",
+                    "description": f"Target timezone: {_TZ_KEYS}"
+                }
+            },
+            "required": ["time", "from_timezone", "to_timezone"]
+        }
+    )
+]
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict):
-    """Execute time/date tools."""
+@server.list_tools()
+async def list_tools():
+    """List available time/date tools."""
+    return _TOOLS_LIST
+
+def _tz(code: str) -> tzinfo:
+    """Resolve a timezone code, falling back to UTC for unknown codes."""
+    return TZ_OBJECTS.get(code, _UTC)
+
+def _parse_fields(text: str, sep: str, widths: Tuple[Tuple[int, int], ...]) -> Tuple[int, ...]:
+    """Split text on sep into integers, each field (min, max) digits long.
     
-    if name == "get_current_time":
-        tz_code = arguments.get("timezone", "UTC")
-        tz_name = TIMEZONES.get(tz_code, "UTC")
-        format_type = arguments.get("format", "24h")
-        
-        tz = pytz.timezone(tz_name)
-        now = datetime.now(tz)
-        
-        if format_type == "12h":
-            time_str = now.strftime("%I:%M:%S %p")
-        else:
-            time_str = now.strftime("%H:%M:%S")
-        
-        return [TextContent(
-            type="text",
-            text=f"Current time in {tz_code}: {time_str}"
-        )]
+    Raises ValueError unless every field is plain digits of an allowed
+    width, matching strptime: %Y takes exactly four digits and the other
+    directives one or two. Signs, spaces and underscores that int() would
+    accept are rejected.
+    """
+    parts = text.split(sep)
+    if len(parts) != len(widths) or not all(
+        part.isdecimal() and lo <= len(part) <= hi
+        for part, (lo, hi) in zip(parts, widths)
+    ):
+        raise ValueError(text)
+    return tuple(map(int, parts))
+
+def _localize(dt: datetime, tz: tzinfo) -> datetime:
+    """Attach tz to a naive wall-clock time, preferring standard time.
     
-    elif name == "get_date":
-        tz_code = arguments.get("timezone", "UTC")
-        tz_name = TIMEZONES.get(tz_code, "UTC")
-        format_type = arguments.get("format", "iso")
-        
-        tz = pytz.timezone(tz_name)
-        now = datetime.now(tz)
-        
-        if format_type == "us":
-            date_str = now.strftime("%m/%d/%Y")
-        elif format_type == "eu":
-            date_str = now.strftime("%d/%m/%Y")
-        else:  # iso
-            date_str = now.strftime("%Y-%m-%d")
-        
-        return [TextContent(
-            type="text",
-            text=f"Current date in {tz_code}: {date_str}"
-        )]
+    Times repeated when clocks fall back resolve to the later, standard-time
+    occurrence (fold=1), and skipped times keep the pre-transition offset,
+    as pytz's localize(is_dst=False) did.
+    """
+    dt = dt.replace(tzinfo=tz)
+    if dt.dst() and not dt.replace(fold=1).dst():
+        return dt.replace(fold=1)
+    return dt
+
+def _cached_time(tz: tzinfo, fmt: str) -> str:
+    """Format the current time in tz, reusing the result within the same second."""
+    second = int(time.time())
+    key = (tz, fmt)
+    cached = _time_cache.get(key)
+    if cached is not None and cached[0] == second:
+        return cached[1]
     
-    elif name == "time_until":
-        target_date = arguments["target_date"]
-        target_time = arguments.get("target_time", "00:00")
-        tz_code = arguments.get("timezone", "UTC")
-        tz_name = TIMEZONES.get(tz_code, "UTC")
-        
-        # Parse target datetime
-        target_str = f"{target_date} {target_time}"
-        tz = pytz.timezone(tz_name)
-        target = tz.localize(datetime.strptime(target_str, "%Y-%m-%d %H:%M"))
-        
-        # Calculate difference
-        now = datetime.now(tz)
-        diff = target - now
-        
-        if diff.total_seconds() < 0:
-            return [TextContent(
-                type="text",
-                text=f"The target date {target_str} has already passed!"
-            )]
-        
-        days = diff.days
-        hours = diff.seconds // 3600
-        minutes = (diff.seconds % 3600) // 60
-        
-        return [TextContent(
-            type="text",
-            text=f"Time until {target_str} {tz_code}: {days} days, {hours} hours, {minutes} minutes"
-        )]
+    if len(_time_cache) > 64:
+        _time_cache.clear()
+    text = datetime.fromtimestamp(second, tz).strftime(fmt)
+    _time_cache[key] = (second, text)
+    return text
+
+async def _handle_get_current_time(arguments: dict):
+    """Report the current time in a timezone."""
+    tz_code = arguments.get("timezone", "UTC")
+    format_type = arguments.get("format", "24h")
+    
+    tz = _tz(tz_code)
+    time_str = _cached_time(tz, _TIME_FORMATS.get(format_type, _DEFAULT_TIME_FORMAT))
+    
+    return [TextContent(
+        type="text",
+        text=f"Current time in {tz_code}: {time_str}"
+    )]
+
+async def _handle_get_date(arguments: dict):
+    """Report the current date in a timezone."""
+    tz_code = arguments.get("timezone", "UTC")
+    format_type = arguments.get("format", "iso")
     
-    elif name == "timezone_converter":
-        time_str = arguments["time"]
-        from_tz = TIMEZONES.get(arguments["from_timezone"], "UTC")
-        to_tz = TIMEZONES.get(arguments["to_timezone"], "UTC")
-        
-        # Create datetime for today with given time
-        today = datetime.now().date()
-        dt = datetime.strptime(f"{today} {time_str}", "%Y-%m-%d %H:%M")
-        
-        # Localize to source timezone
-        from_zone = pytz.timezone(from_tz)
-        dt_from = from_zone.localize(dt)
-        
-        # Convert to target timezone
-        to_zone = pytz.timezone(to_tz)
-        dt_to = dt_from.astimezone(to_zone)
-        
+    tz = _tz(tz_code)
+    date_str = _cached_time(tz, _DATE_FORMATS.get(format_type, _DEFAULT_DATE_FORMAT))
+    
+    return [TextContent(
+        type="text",
+        text=f"Current date in {tz_code}: {date_str}"
+    )]
+
+async def _handle_time_until(arguments: dict):
+    """Report the time remaining until a future date."""
+    target_date = arguments["target_date"]
+    target_time = arguments.get("target_time", "00:00")
+    tz_code = arguments.get("timezone", "UTC")
+    
+    # Parse target datetime from its components instead of a strptime round-trip
+    try:
+        year, month, day = _parse_fields(target_date, "-", ((4, 4), (1, 2), (1, 2)))
+        hour, minute = _parse_fields(target_time, ":", ((1, 2), (1, 2)))
+        target = datetime(year, month, day, hour, minute)
+    except ValueError:
+        raise ValueError(
+            f"time data '{target_date} {target_time}' does not match format '%Y-%m-%d %H:%M'"
+        ) from None
+    target = _localize(target, _tz(tz_code))
+    
+    # Calculate difference in UTC; subtracting two datetimes that share a
+    # ZoneInfo would ignore any DST change between them
+    now = datetime.now(timezone.utc)
+    diff = target.astimezone(timezone.utc) - now
+    
+    if diff.total_seconds() < 0:
         return [TextContent(
             type="text",
-            text=f"{time_str} {arguments['from_timezone']} = {dt_to.strftime('%H:%M')} {arguments['to_timezone']}"
+            text=f"The target date {target_date} {target_time} has already passed!"
         )]
     
-    else:
+    days = diff.days
+    hours = diff.seconds // 3600
+    minutes = (diff.seconds % 3600) // 60
+    
+    return [TextContent(
+        type="text",
+        text=f"Time until {target_date} {target_time} {tz_code}: {days} days, {hours} hours, {minutes} minutes"
+    )]
+
+async def _handle_timezone_converter(arguments: dict):
+    """Convert a time of day between timezones."""
+    time_str = arguments["time"]
+    from_zone = _tz(arguments["from_timezone"])
+    to_zone = _tz(arguments["to_timezone"])
+    
+    # Create datetime for today with given time, parsing HH:MM directly
+    # rather than through strptime's general-purpose parser
+    today = datetime.now().date()
+    try:
+        hour, minute = _parse_fields(time_str, ":", ((1, 2), (1, 2)))
+        dt = datetime(today.year, today.month, today.day, hour, minute)
+    except ValueError:
+        raise ValueError(f"time data {time_str!r} does not match format '%H:%M'") from None
+    
+    # Attach source timezone
+    dt_from = _localize(dt, from_zone)
+    
+    # Convert to target timezone
+    dt_to = dt_from.astimezone(to_zone)
+    
+    return [TextContent(
+        type="text",
+        text=f"{time_str} {arguments['from_timezone']} = {dt_to.strftime(_CONVERTED_TIME_FORMAT)} {arguments['to_timezone']}"
+    )]
+
+_HANDLERS = {
+    "get_current_time": _handle_get_current_time,
+    "get_date": _handle_get_date,
+    "time_until": _handle_time_until,
+    "timezone_converter": _handle_timezone_converter
+}
+
+@server.call_tool()
+async def call_tool(name: str, arguments: dict):
+    """Execute time/date tools."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
         return [TextContent(
             type="text",
             text=f"Unknown tool: {name}"
         )]
+    return await handler(arguments)
 
 async def main():
     """Run the time server."""
@@ -225,4 +306,7 @@ async def main():
         await server.run(read_stream, write_stream, {})
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file